@@ -1,7 +1,15 @@
+import io
 import os
-from flask import Flask, make_response, request, jsonify
+import time
+from datetime import timedelta
+
+import click
+from flask import Flask, make_response, request, jsonify, Response, stream_with_context
 from flask_migrate import Migrate
+
 from models import db, Hero, Power, HeroPower
+import data_transfer
+import deletion
 
 app = Flask(__name__)
 
@@ -10,6 +18,10 @@ db_path = os.path.abspath(os.path.join(os.getcwd(), "Superheroes", "superheroes.
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Soft-delete mode only marks heroes and powers as deleted; purge-deleted removes them later
+app.config['SOFT_DELETE'] = os.environ.get('SOFT_DELETE', 'false').lower() == 'true'
+app.config['DELETE_BATCH_SIZE'] = int(os.environ.get('DELETE_BATCH_SIZE', deletion.BATCH_SIZE))
+
 migrate = Migrate(app, db)
 db.init_app(app)
 
@@ -30,11 +42,30 @@ def get_json_data():
     except Exception as e:
         return None, f"JSON parsing error: {str(e)}"
 
+# Helper functions that hide soft-deleted records from every read
+def get_active(model, id):
+    record = model.query.get(id)
+    if not record or record.deleted_at is not None:
+        return None
+    return record
+
+def get_active_hero_power(id):
+    hero_power = HeroPower.query.get(id)
+    if not hero_power or hero_power.hero.deleted_at is not None or hero_power.power.deleted_at is not None:
+        return None
+    return hero_power
+
+def delete_record(model, record):
+    if app.config['SOFT_DELETE']:
+        deletion.soft_delete(record)
+    else:
+        deletion.hard_delete(model, record.id, app.config['DELETE_BATCH_SIZE'])
+
 # GET /heroes
 @app.route('/heroes', methods=['GET'])
 def get_heroes():
     try:
-        heroes = Hero.query.all()
+        heroes = Hero.query.filter(Hero.deleted_at.is_(None)).all()
         heroes_data = []
         
         for hero in heroes:
@@ -88,7 +119,7 @@ def create_hero():
 @app.route('/heroes/<int:id>', methods=['GET'])
 def get_hero_by_id(id):
     try:
-        hero = Hero.query.get(id)
+        hero = get_active(Hero, id)
         
         if not hero:
             return make_response(jsonify({'error': 'Hero not found'}), 404)
@@ -101,6 +132,8 @@ def get_hero_by_id(id):
         }
         
         for hero_power in hero.hero_powers:
+            if hero_power.power.deleted_at is not None:
+                continue
             hero_power_data = {
                 'id': hero_power.id,
                 'hero_id': hero_power.hero_id,
@@ -122,7 +155,7 @@ def get_hero_by_id(id):
 @app.route('/heroes/<int:id>', methods=['PATCH'])
 def update_hero(id):
     try:
-        hero = Hero.query.get(id)
+        hero = get_active(Hero, id)
         
         if not hero:
             return make_response(jsonify({'error': 'Hero not found'}), 404)
@@ -154,13 +187,12 @@ def update_hero(id):
 @app.route('/heroes/<int:id>', methods=['DELETE'])
 def delete_hero(id):
     try:
-        hero = Hero.query.get(id)
+        hero = get_active(Hero, id)
         
         if not hero:
             return make_response(jsonify({'error': 'Hero not found'}), 404)
         
-        db.session.delete(hero)
-        db.session.commit()
+        delete_record(Hero, hero)
         
         return make_response(jsonify({'message': 'Hero deleted successfully'}), 200)
     except Exception as e:
@@ -171,7 +203,7 @@ def delete_hero(id):
 @app.route('/powers', methods=['GET'])
 def get_powers():
     try:
-        powers = Power.query.all()
+        powers = Power.query.filter(Power.deleted_at.is_(None)).all()
         powers_data = []
         
         for power in powers:
@@ -231,7 +263,7 @@ def create_power():
 @app.route('/powers/<int:id>', methods=['GET'])
 def get_power_by_id(id):
     try:
-        power = Power.query.get(id)
+        power = get_active(Power, id)
         
         if not power:
             return make_response(jsonify({'error': 'Power not found'}), 404)
@@ -250,7 +282,7 @@ def get_power_by_id(id):
 @app.route('/powers/<int:id>', methods=['PATCH'])
 def update_power(id):
     try:
-        power = Power.query.get(id)
+        power = get_active(Power, id)
         
         if not power:
             return make_response(jsonify({'error': 'Power not found'}), 404)
@@ -289,13 +321,12 @@ def update_power(id):
 @app.route('/powers/<int:id>', methods=['DELETE'])
 def delete_power(id):
     try:
-        power = Power.query.get(id)
+        power = get_active(Power, id)
         
         if not power:
             return make_response(jsonify({'error': 'Power not found'}), 404)
         
-        db.session.delete(power)
-        db.session.commit()
+        delete_record(Power, power)
         
         return make_response(jsonify({'message': 'Power deleted successfully'}), 200)
     except Exception as e:
@@ -306,7 +337,10 @@ def delete_power(id):
 @app.route('/hero_powers', methods=['GET'])
 def get_hero_powers():
     try:
-        hero_powers = HeroPower.query.all()
+        hero_powers = HeroPower.query.join(Hero).join(Power).filter(
+            Hero.deleted_at.is_(None),
+            Power.deleted_at.is_(None)
+        ).all()
         hero_powers_data = []
         
         for hero_power in hero_powers:
@@ -358,8 +392,8 @@ def create_hero_power():
             return make_response(jsonify({'errors': ['power_id is required']}), 400)
         
         # Checking if hero and power exist
-        hero = Hero.query.get(hero_id)
-        power = Power.query.get(power_id)
+        hero = get_active(Hero, hero_id)
+        power = get_active(Power, power_id)
         
         if not hero:
             return make_response(jsonify({'errors': [f'Hero with id {hero_id} not found']}), 400)
@@ -407,7 +441,7 @@ def create_hero_power():
 @app.route('/hero_powers/<int:id>', methods=['GET'])
 def get_hero_power_by_id(id):
     try:
-        hero_power = HeroPower.query.get(id)
+        hero_power = get_active_hero_power(id)
         
         if not hero_power:
             return make_response(jsonify({'error': 'HeroPower not found'}), 404)
@@ -437,7 +471,7 @@ def get_hero_power_by_id(id):
 @app.route('/hero_powers/<int:id>', methods=['PATCH'])
 def update_hero_power(id):
     try:
-        hero_power = HeroPower.query.get(id)
+        hero_power = get_active_hero_power(id)
         
         if not hero_power:
             return make_response(jsonify({'error': 'HeroPower not found'}), 404)
@@ -484,7 +518,7 @@ def update_hero_power(id):
 @app.route('/hero_powers/<int:id>', methods=['DELETE'])
 def delete_hero_power(id):
     try:
-        hero_power = HeroPower.query.get(id)
+        hero_power = get_active_hero_power(id)
         
         if not hero_power:
             return make_response(jsonify({'error': 'HeroPower not found'}), 404)
@@ -497,6 +531,110 @@ def delete_hero_power(id):
         db.session.rollback()
         return make_response(jsonify({'error': f'Error deleting hero power: {str(e)}'}), 500)
 
+# GET /export/<table_name>
+@app.route('/export/<table_name>', methods=['GET'])
+def export_table(table_name):
+    if table_name not in data_transfer.TABLES:
+        return make_response(jsonify({'error': f'Unknown table {table_name}'}), 404)
+
+    export_format = request.args.get('format', 'ndjson')
+    if export_format == 'columnar':
+        export_format = data_transfer.columnar_format(streaming=True)
+
+    if export_format not in data_transfer.STREAMERS:
+        return make_response(jsonify({'error': 'format must be one of: ndjson, csv, arrow, columnar'}), 400)
+
+    if export_format == 'arrow' and data_transfer.pa is None:
+        return make_response(jsonify({'error': 'arrow format requires pyarrow to be installed'}), 400)
+
+    mimetypes = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+        'arrow': 'application/vnd.apache.arrow.stream',
+    }
+    extension = data_transfer.FILE_EXTENSIONS[export_format]
+
+    # Rows are streamed batch by batch so memory use does not grow with the table;
+    # like every other read, soft-deleted records are left out
+    streamer = data_transfer.STREAMERS[export_format]
+    return Response(
+        stream_with_context(streamer(table_name, include_deleted=False)),
+        status=200,
+        mimetype=mimetypes[export_format],
+        headers={'Content-Disposition': f'attachment; filename={table_name}.{extension}'}
+    )
+
+# POST /import/<table_name>
+@app.route('/import/<table_name>', methods=['POST'])
+def import_table(table_name):
+    if table_name not in data_transfer.TABLES:
+        return make_response(jsonify({'error': f'Unknown table {table_name}'}), 404)
+
+    try:
+        # NDJSON body is read line by line from the request stream
+        lines = io.TextIOWrapper(request.stream, encoding='utf-8')
+        count = data_transfer.import_rows(table_name, data_transfer.read_ndjson(lines), include_deleted=False)
+        return make_response(jsonify({'table': table_name, 'imported': count}), 201)
+    except data_transfer.DataImportError as e:
+        # Earlier batches stay committed, so say how far the import got
+        return make_response(jsonify({
+            'errors': [str(e)],
+            'imported': e.committed,
+            'failed_row': e.row
+        }), 400)
+    except Exception as e:
+        db.session.rollback()
+        return make_response(jsonify({'errors': [f'Error importing {table_name}: {str(e)}']}), 400)
+
+# flask export-data <directory>
+@app.cli.command('export-data')
+@click.argument('directory')
+@click.option('--format', 'export_format', default='ndjson',
+              type=click.Choice(['ndjson', 'columnar', 'csv', 'parquet', 'arrow']))
+@click.option('--batch-size', default=data_transfer.BATCH_SIZE, show_default=True)
+def export_data(directory, export_format, batch_size):
+    if export_format == 'columnar':
+        export_format = data_transfer.columnar_format()
+    if export_format in ('parquet', 'arrow') and data_transfer.pa is None:
+        raise click.ClickException(f'{export_format} format requires pyarrow to be installed')
+
+    for path in data_transfer.export_dataset(directory, export_format, batch_size):
+        click.echo(f"Exported {path}")
+
+# flask import-data <directory>
+@app.cli.command('import-data')
+@click.argument('directory')
+@click.option('--batch-size', default=data_transfer.BATCH_SIZE, show_default=True)
+def import_data(directory, batch_size):
+    try:
+        counts = data_transfer.import_dataset(directory, batch_size)
+    except (data_transfer.DataImportError, ValueError) as e:
+        raise click.ClickException(str(e))
+    for table_name, count in counts.items():
+        click.echo(f"Imported {count} rows into {table_name}")
+
+# flask purge-deleted
+@app.cli.command('purge-deleted')
+@click.option('--older-than', default=0, show_default=True, help='Only purge records soft-deleted at least this many seconds ago.')
+@click.option('--interval', default=0, help='Keep running in the background, purging every INTERVAL seconds.')
+@click.option('--batch-size', default=None, type=int, help='Defaults to the DELETE_BATCH_SIZE setting.')
+def purge_deleted(older_than, interval, batch_size):
+    batch_size = batch_size or app.config['DELETE_BATCH_SIZE']
+    while True:
+        try:
+            counts = deletion.purge_deleted(timedelta(seconds=older_than), batch_size)
+            for table_name, count in counts.items():
+                click.echo(f"Purged {count} rows from {table_name}")
+        except Exception as e:
+            # e.g. "database is locked" while the API is writing; try again next round
+            db.session.rollback()
+            if not interval:
+                raise click.ClickException(f"Error purging deleted records: {str(e)}")
+            click.echo(f"Error purging deleted records: {str(e)}", err=True)
+        if not interval:
+            break
+        time.sleep(interval)
+
 # Debugging route
 @app.route('/debug', methods=['POST'])
 def debug():
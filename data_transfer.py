@@ -0,0 +1,328 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Hero, Power, HeroPower
+
+# pyarrow is optional - without it the columnar format falls back to CSV
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+BATCH_SIZE = 1000
+
+# Tables listed in foreign key order so imports never reference missing rows
+MODELS = {
+    'heroes': Hero,
+    'powers': Power,
+    'hero_powers': HeroPower,
+}
+TABLES = {table_name: model.__table__ for table_name, model in MODELS.items()}
+
+FILE_EXTENSIONS = {
+    'ndjson': 'ndjson',
+    'csv': 'csv',
+    'parquet': 'parquet',
+    'arrow': 'arrows',
+}
+
+def columnar_format(streaming=False):
+    # Arrow IPC streams over HTTP, Parquet needs a real file for its footer
+    if pa is None:
+        return 'csv'
+    return 'arrow' if streaming else 'parquet'
+
+def get_table(table_name):
+    table = TABLES.get(table_name)
+    if table is None:
+        raise ValueError(f"Unknown table '{table_name}', expected one of: {', '.join(TABLES)}")
+    return table
+
+# Reading
+
+def _select_rows(table, include_deleted):
+    query = select(table)
+    if include_deleted:
+        return query
+    # Leave out soft-deleted rows and links whose hero or power is soft-deleted
+    if 'deleted_at' in table.c:
+        query = query.where(table.c.deleted_at.is_(None))
+    for foreign_key in table.foreign_keys:
+        parent = foreign_key.column.table
+        if 'deleted_at' in parent.c:
+            query = query.join(parent, foreign_key.parent == foreign_key.column).where(parent.c.deleted_at.is_(None))
+    return query
+
+def iter_batches(table_name, batch_size=BATCH_SIZE, include_deleted=True):
+    table = get_table(table_name)
+    # Server-side cursor: rows are fetched batch_size at a time instead of all at once
+    result = db.session.execute(
+        _select_rows(table, include_deleted).order_by(table.c.id),
+        execution_options={'stream_results': True, 'max_row_buffer': batch_size}
+    )
+    for partition in result.partitions(batch_size):
+        yield [dict(row._mapping) for row in partition]
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def iter_ndjson(table_name, batch_size=BATCH_SIZE, include_deleted=True):
+    for batch in iter_batches(table_name, batch_size, include_deleted):
+        yield ''.join(json.dumps(row, default=_json_default) + '\n' for row in batch)
+
+def iter_csv(table_name, batch_size=BATCH_SIZE, include_deleted=True):
+    table = get_table(table_name)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table.columns.keys())
+    for batch in iter_batches(table_name, batch_size, include_deleted):
+        for row in batch:
+            writer.writerow(['' if value is None else _csv_value(value) for value in row.values()])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Header only, for empty tables
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _arrow_schema(table):
+    fields = []
+    for column in table.columns:
+        python_type = column.type.python_type
+        if python_type is int:
+            arrow_type = pa.int64()
+        elif python_type is datetime:
+            arrow_type = pa.timestamp('us')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+def iter_arrow(table_name, batch_size=BATCH_SIZE, include_deleted=True):
+    table = get_table(table_name)
+    schema = _arrow_schema(table)
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+    for batch in iter_batches(table_name, batch_size, include_deleted):
+        writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate(0)
+    writer.close()
+    yield sink.getvalue()
+
+STREAMERS = {
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+    'arrow': iter_arrow,
+}
+
+def export_table(table_name, path, export_format, batch_size=BATCH_SIZE):
+    if export_format == 'parquet':
+        schema = _arrow_schema(get_table(table_name))
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in iter_batches(table_name, batch_size):
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+        return
+
+    if export_format == 'arrow':
+        f = open(path, 'wb')
+    else:
+        f = open(path, 'w', newline='', encoding='utf-8')
+    with f:
+        for chunk in STREAMERS[export_format](table_name, batch_size):
+            f.write(chunk)
+
+def export_dataset(directory, export_format, batch_size=BATCH_SIZE):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for table_name in TABLES:
+        path = os.path.join(directory, f"{table_name}.{FILE_EXTENSIONS[export_format]}")
+        export_table(table_name, path, export_format, batch_size)
+        paths.append(path)
+    return paths
+
+# Writing
+
+class DataImportError(Exception):
+    def __init__(self, message, table_name, row, committed):
+        super().__init__(f"{table_name} row {row}: {message} ({committed} rows were committed before it)")
+        self.table_name = table_name
+        self.row = row
+        self.committed = committed
+
+def _to_int(name, value):
+    # int() would quietly turn 1.7 into 1 and True into 1
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+def _coerce(table, row):
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object, got {row!r}")
+    # CSV gives back strings only, so convert them to the column types
+    values = {}
+    for column in table.columns:
+        value = row.get(column.name)
+        python_type = column.type.python_type
+        if value is None or (value == '' and python_type is not str):
+            value = None
+        elif python_type is int:
+            value = _to_int(column.name, value)
+        elif python_type is datetime:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, datetime):
+                raise ValueError(f"{column.name} must be an ISO 8601 datetime, got {value!r}")
+        elif python_type is str:
+            if not isinstance(value, str):
+                raise ValueError(f"{column.name} must be a string, got {value!r}")
+            value = value.strip()
+        values[column.name] = value
+    return values
+
+def _validate_row(table_name, table, values):
+    # Same checks as the POST endpoints: required fields must be non-empty
+    for column in table.columns:
+        if column.nullable or column.primary_key:
+            continue
+        if values[column.name] is None or values[column.name] == '':
+            raise ValueError(f"{column.name} is required and cannot be empty")
+    # Same rules the models enforce on the ORM path
+    for key, (validator, _) in MODELS[table_name].__mapper__.validators.items():
+        validator(None, key, values[key])
+
+def _validate_batch(table, batch, include_deleted):
+    # batch holds (row number, values) pairs; checks ids against the table
+    # and the rows already committed by earlier batches of the same import.
+    # Without include_deleted, soft-deleted parents count as missing, the
+    # same as POST /hero_powers.
+    ids = [values['id'] for _, values in batch if values['id'] is not None]
+    existing = set(db.session.execute(select(table.c.id).where(table.c.id.in_(ids))).scalars())
+    seen = set()
+    for row_number, values in batch:
+        if values['id'] in existing or values['id'] in seen:
+            return row_number, f"id {values['id']} already exists"
+        if values['id'] is not None:
+            seen.add(values['id'])
+
+    for foreign_key in table.foreign_keys:
+        column = foreign_key.parent.name
+        parent = foreign_key.column.table
+        referenced = {values[column] for _, values in batch}
+        query = select(parent.c.id).where(parent.c.id.in_(referenced))
+        if not include_deleted and 'deleted_at' in parent.c:
+            query = query.where(parent.c.deleted_at.is_(None))
+        found = set(db.session.execute(query).scalars())
+        for row_number, values in batch:
+            if values[column] not in found:
+                return row_number, f"{column} {values[column]} not found in {parent.name}"
+    return None
+
+def _insert_batch(table, batch, committed, include_deleted):
+    error = _validate_batch(table, batch, include_deleted)
+    if error:
+        db.session.rollback()
+        row_number, message = error
+        raise DataImportError(message, table.name, row_number, committed)
+    try:
+        db.session.execute(insert(table), [values for _, values in batch])
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise DataImportError(str(getattr(e, 'orig', None) or e), table.name, batch[0][0], committed) from e
+    return committed + len(batch)
+
+def read_ndjson(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def read_csv(f):
+    yield from csv.DictReader(f)
+
+def read_parquet(path, batch_size=BATCH_SIZE):
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+def read_arrow(f):
+    for batch in pa.ipc.open_stream(f):
+        yield from batch.to_pylist()
+
+_END = object()
+
+def import_rows(table_name, rows, batch_size=BATCH_SIZE, include_deleted=True):
+    table = get_table(table_name)
+    committed = 0
+    batch = []
+    row_number = 0
+    rows = iter(rows)
+    # Each batch is validated, then inserted with one executemany in its own
+    # short transaction; ids are kept so foreign keys point at the same rows.
+    # A failure raises DataImportError saying which row broke and how many
+    # rows from earlier batches are already committed.
+    while True:
+        row_number += 1
+        try:
+            row = next(rows, _END)
+            if row is _END:
+                break
+            values = _coerce(table, row)
+            _validate_row(table_name, table, values)
+        except (AttributeError, TypeError, ValueError) as e:
+            db.session.rollback()
+            raise DataImportError(str(e), table_name, row_number, committed) from e
+        batch.append((row_number, values))
+        if len(batch) >= batch_size:
+            committed = _insert_batch(table, batch, committed, include_deleted)
+            batch = []
+    if batch:
+        committed = _insert_batch(table, batch, committed, include_deleted)
+    return committed
+
+def import_table(table_name, path, batch_size=BATCH_SIZE):
+    if path.endswith(('.parquet', '.arrows')) and pa is None:
+        raise ValueError(f"Reading {path} requires pyarrow to be installed")
+    if path.endswith('.parquet'):
+        return import_rows(table_name, read_parquet(path, batch_size), batch_size)
+    if path.endswith('.arrows'):
+        with open(path, 'rb') as f:
+            return import_rows(table_name, read_arrow(f), batch_size)
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = read_csv(f) if path.endswith('.csv') else read_ndjson(f)
+        return import_rows(table_name, reader, batch_size)
+
+def import_dataset(directory, batch_size=BATCH_SIZE):
+    if not os.path.isdir(directory):
+        raise ValueError(f"{directory} is not a directory")
+
+    paths = {}
+    for table_name in TABLES:
+        for extension in ('ndjson', 'parquet', 'arrows', 'csv'):
+            path = os.path.join(directory, f"{table_name}.{extension}")
+            if os.path.exists(path):
+                paths[table_name] = path
+                break
+    if not paths:
+        raise ValueError(f"No export files found in {directory}")
+
+    counts = {}
+    for table_name, path in paths.items():
+        counts[table_name] = import_table(table_name, path, batch_size)
+    return counts
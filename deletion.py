@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete
+from models import db, Hero, Power, HeroPower
+
+BATCH_SIZE = 1000
+
+# Which hero_powers column points at each parent model
+LINK_COLUMNS = {
+    Hero: HeroPower.__table__.c.hero_id,
+    Power: HeroPower.__table__.c.power_id,
+}
+
+def delete_links(model, id, batch_size=BATCH_SIZE):
+    # Removes linked hero_powers in small committed chunks instead of loading
+    # them all into the session, so no single transaction holds locks for long
+    links = HeroPower.__table__
+    column = LINK_COLUMNS[model]
+    chunk = select(links.c.id).where(column == id).limit(batch_size).scalar_subquery()
+    count = 0
+    while True:
+        result = db.session.execute(delete(links).where(links.c.id.in_(chunk)))
+        db.session.commit()
+        if result.rowcount == 0:
+            return count
+        count += result.rowcount
+
+def hard_delete(model, id, batch_size=BATCH_SIZE):
+    delete_links(model, id, batch_size)
+    # Links added while the chunks ran are removed together with the parent row
+    db.session.execute(delete(HeroPower.__table__).where(LINK_COLUMNS[model] == id))
+    db.session.execute(delete(model.__table__).where(model.__table__.c.id == id))
+    db.session.commit()
+
+def soft_delete(record):
+    # Only marks the row - links stay in place until purge_deleted runs
+    record.deleted_at = datetime.utcnow()
+    db.session.commit()
+
+def purge_deleted(older_than=None, batch_size=BATCH_SIZE):
+    cutoff = datetime.utcnow() - (older_than or timedelta(0))
+    counts = {}
+    for model in (Hero, Power):
+        table = model.__table__
+        ids = db.session.execute(
+            select(table.c.id).where(table.c.deleted_at.is_not(None), table.c.deleted_at <= cutoff)
+        ).scalars().all()
+        db.session.commit()
+        for id in ids:
+            hard_delete(model, id, batch_size)
+        counts[table.name] = len(ids)
+    return counts
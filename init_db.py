@@ -5,6 +5,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from flask import Flask
+from sqlalchemy import inspect, text
 from models import db
 
 # Creating a minimal Flask app for database initialization
@@ -21,12 +22,30 @@ def ensure_directory_exists():
         os.makedirs(superheroes_dir)
         print(f"Created Superheroes directory at: {superheroes_dir}")
 
+def upgrade_schema():
+    # create_all only creates missing tables, so columns and indexes added to
+    # existing tables later are applied here. Safe to run more than once;
+    # new columns must be nullable for ADD COLUMN to work on existing rows.
+    inspector = inspect(db.engine)
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    print(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                columns = ', '.join(column.name for column in index.columns)
+                connection.execute(text(f"CREATE INDEX IF NOT EXISTS {index.name} ON {table.name} ({columns})"))
+
 def init_database():
     ensure_directory_exists()
     print(f"Database will be created at: {db_path}")
     with app.app_context():
         db.init_app(app)
         db.create_all()
+        upgrade_schema()
         print("Database tables created successfully!")
 
 if __name__ == "__main__":
@@ -12,12 +12,13 @@ class Hero(db.Model, SerializerMixin):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, nullable=False)
     super_name = db.Column(db.String, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
     
     # Relationship
     hero_powers = db.relationship('HeroPower', back_populates='hero', cascade='all, delete-orphan')
     
     # Serialization rules
-    serialize_rules = ('-hero_powers.hero',)
+    serialize_rules = ('-hero_powers.hero', '-deleted_at')
 
 class Power(db.Model, SerializerMixin):
     __tablename__ = 'powers'
@@ -25,12 +26,13 @@ class Power(db.Model, SerializerMixin):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, nullable=False)
     description = db.Column(db.String, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
     
     # Relationship
     hero_powers = db.relationship('HeroPower', back_populates='power', cascade='all, delete-orphan')
     
     # Serialization rules
-    serialize_rules = ('-hero_powers.power',)
+    serialize_rules = ('-hero_powers.power', '-deleted_at')
     
     @validates('description')
     def validate_description(self, key, description):
@@ -43,8 +45,8 @@ class HeroPower(db.Model, SerializerMixin):
     
     id = db.Column(db.Integer, primary_key=True)
     strength = db.Column(db.String, nullable=False)
-    hero_id = db.Column(db.Integer, db.ForeignKey('heroes.id'), nullable=False)
-    power_id = db.Column(db.Integer, db.ForeignKey('powers.id'), nullable=False)
+    hero_id = db.Column(db.Integer, db.ForeignKey('heroes.id'), nullable=False, index=True)
+    power_id = db.Column(db.Integer, db.ForeignKey('powers.id'), nullable=False, index=True)
     
     # Relationships
     hero = db.relationship('Hero', back_populates='hero_powers')
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    # app.py builds its database path from the working directory at import time
+    directory = tmp_path_factory.mktemp('db')
+    os.makedirs(directory / 'Superheroes')
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        from app import app
+    finally:
+        os.chdir(cwd)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    from models import db
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    app.config['SOFT_DELETE'] = False
+    return app.test_client()
+
+
+@pytest.fixture
+def seeded(client):
+    client.post('/heroes', json={'name': 'Kamala Khan', 'super_name': 'Ms. Marvel'})
+    client.post('/heroes', json={'name': 'Doreen Green', 'super_name': 'Squirrel Girl'})
+    client.post('/powers', json={'name': 'flight', 'description': 'gives the wielder the ability to fly'})
+    client.post('/powers', json={'name': 'elasticity', 'description': 'can stretch the human body to extreme lengths'})
+    client.post('/hero_powers', json={'strength': 'Strong', 'hero_id': 1, 'power_id': 1})
+    client.post('/hero_powers', json={'strength': 'Weak', 'hero_id': 2, 'power_id': 2})
+    return client
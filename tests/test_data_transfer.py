@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+import data_transfer
+from models import db
+
+
+def ndjson(*rows):
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def export_all(client):
+    return {table_name: client.get(f'/export/{table_name}').data for table_name in data_transfer.TABLES}
+
+
+@pytest.mark.parametrize('export_format', ['ndjson', 'csv'])
+def test_round_trip_into_fresh_database(app, seeded, tmp_path, export_format):
+    before = export_all(seeded)
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['export-data', str(tmp_path), '--format', export_format])
+    assert result.exit_code == 0
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    result = runner.invoke(args=['import-data', str(tmp_path)])
+    assert result.exit_code == 0, result.output
+
+    assert export_all(seeded) == before
+    assert seeded.get('/heroes/2').json['hero_powers'][0]['power']['name'] == 'elasticity'
+
+
+def test_export_streams_ndjson_rows(seeded):
+    response = seeded.get('/export/heroes')
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [row['super_name'] for row in rows] == ['Ms. Marvel', 'Squirrel Girl']
+
+
+def test_import_keeps_ids(seeded):
+    response = seeded.post('/import/heroes', data=ndjson({'id': 40, 'name': 'Jean Grey', 'super_name': 'Phoenix'}))
+    assert response.status_code == 201
+    assert seeded.get('/heroes/40').json['super_name'] == 'Phoenix'
+
+
+def test_null_line_is_rejected_not_treated_as_end(seeded):
+    body = ndjson({'id': 41, 'name': 'a', 'super_name': 'b'}) + 'null\n' + ndjson({'id': 42, 'name': 'c', 'super_name': 'd'})
+    response = seeded.post('/import/heroes', data=body)
+    assert response.status_code == 400
+    assert response.json['failed_row'] == 2
+    assert response.json['imported'] == 0
+    assert seeded.get('/heroes/42').status_code == 404
+
+
+@pytest.mark.parametrize('row, message', [
+    ({'id': 1, 'name': 'a', 'super_name': 'b'}, 'id 1 already exists'),
+    ({'id': 50, 'name': '  ', 'super_name': 'b'}, 'name is required'),
+    ({'id': 50, 'name': 5, 'super_name': 'b'}, 'name must be a string'),
+    ({'id': 1.7, 'name': 'a', 'super_name': 'b'}, 'id must be an integer'),
+    ({'id': True, 'name': 'a', 'super_name': 'b'}, 'id must be an integer'),
+])
+def test_invalid_hero_rows_are_rejected(seeded, row, message):
+    response = seeded.post('/import/heroes', data=ndjson(row))
+    assert response.status_code == 400
+    assert message in response.json['errors'][0]
+
+
+@pytest.mark.parametrize('row, message', [
+    ({'strength': 'Bogus', 'hero_id': 1, 'power_id': 1}, 'Strength must be one of'),
+    ({'strength': 'Weak', 'hero_id': 1, 'power_id': 777}, 'power_id 777 not found'),
+    ({'strength': 'Weak', 'hero_id': 1.0, 'power_id': 2.5}, 'power_id must be an integer'),
+])
+def test_invalid_hero_power_rows_are_rejected(seeded, row, message):
+    response = seeded.post('/import/hero_powers', data=ndjson(row))
+    assert response.status_code == 400
+    assert message in response.json['errors'][0]
+    assert seeded.get('/heroes/1').status_code == 200
+
+
+def test_import_rejects_links_to_soft_deleted_parents(app, seeded):
+    app.config['SOFT_DELETE'] = True
+    seeded.delete('/powers/2')
+    response = seeded.post('/import/hero_powers', data=ndjson({'strength': 'Weak', 'hero_id': 1, 'power_id': 2}))
+    assert response.status_code == 400
+    assert 'power_id 2 not found' in response.json['errors'][0]
+
+
+def test_failure_reports_rows_committed_by_earlier_batches(app, seeded):
+    rows = [{'id': 100 + i, 'name': 'n', 'super_name': 's'} for i in range(5)] + [{'id': 100, 'name': 'n', 'super_name': 's'}]
+    with app.app_context():
+        with pytest.raises(data_transfer.DataImportError) as error:
+            data_transfer.import_rows('heroes', rows, batch_size=2)
+    assert error.value.row == 6
+    assert error.value.committed == 4
+
+
+def test_import_data_fails_for_missing_or_empty_directory(app, tmp_path):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['import-data', str(tmp_path / 'missing')])
+    assert result.exit_code != 0
+    assert 'is not a directory' in result.output
+
+    result = runner.invoke(args=['import-data', str(tmp_path)])
+    assert result.exit_code != 0
+    assert 'No export files found' in result.output
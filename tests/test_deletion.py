@@ -0,0 +1,64 @@
+import deletion
+from models import db, Hero, Power, HeroPower
+
+
+def add_links(app, power_id, count):
+    with app.app_context():
+        db.session.execute(HeroPower.__table__.insert(), [
+            {'strength': 'Weak', 'hero_id': i % 2 + 1, 'power_id': power_id} for i in range(count)
+        ])
+        db.session.commit()
+
+
+def count_links(app, power_id):
+    with app.app_context():
+        return HeroPower.query.filter_by(power_id=power_id).count()
+
+
+def test_hard_delete_removes_links_in_chunks(app, seeded):
+    add_links(app, 1, 250)
+    app.config['DELETE_BATCH_SIZE'] = 40
+    try:
+        response = seeded.delete('/powers/1')
+    finally:
+        app.config['DELETE_BATCH_SIZE'] = deletion.BATCH_SIZE
+
+    assert response.status_code == 200
+    assert seeded.get('/powers/1').status_code == 404
+    assert count_links(app, 1) == 0
+    assert count_links(app, 2) == 1
+
+
+def test_delete_links_returns_number_removed(app, seeded):
+    add_links(app, 2, 25)
+    with app.app_context():
+        assert deletion.delete_links(Power, 2, batch_size=10) == 26
+
+
+def test_soft_delete_hides_records_until_purged(app, seeded):
+    app.config['SOFT_DELETE'] = True
+    assert seeded.delete('/heroes/2').status_code == 200
+
+    assert seeded.get('/heroes/2').status_code == 404
+    assert [hero['id'] for hero in seeded.get('/heroes').json] == [1]
+    assert [link['hero_id'] for link in seeded.get('/hero_powers').json] == [1]
+    assert b'Squirrel Girl' not in seeded.get('/export/heroes').data
+    # The row and its link are still stored until the purge runs
+    assert count_links(app, 2) == 1
+
+    result = app.test_cli_runner().invoke(args=['purge-deleted'])
+    assert result.exit_code == 0
+    assert 'Purged 1 rows from heroes' in result.output
+    with app.app_context():
+        assert db.session.get(Hero, 2) is None
+    assert count_links(app, 2) == 0
+
+
+def test_purge_respects_older_than(app, seeded):
+    app.config['SOFT_DELETE'] = True
+    seeded.delete('/powers/1')
+
+    result = app.test_cli_runner().invoke(args=['purge-deleted', '--older-than', '3600'])
+    assert 'Purged 0 rows from powers' in result.output
+    with app.app_context():
+        assert db.session.get(Power, 1) is not None